@@ -4,10 +4,10 @@
 タスク管理ボード（完全版 / 複数人運用向け / タイムゾーン安全化 / UI大幅改善 + 一覧の可読性強化）
 
 機能要約:
-- CSV 永続化 + GitHub 連携（SHA 楽観的ロック / 成否でUI分岐 / committer情報）
+- Parquet 永続化（CSV は GitHub 連携/ダウンロード用のエクスポート）+ GitHub 連携（SHA 楽観的ロック / 成否でUI分岐 / committer情報）
 - 起票日は自動・編集不可、更新日は編集/クローズ時に自動更新（JST）
 - 簡易ログイン（Secrets USERS によるトークン方式）
-- 監査ログ（audit.csv）: 作成 / 更新 / 削除 / 一括削除 / クローズ を記録（任意で GitHub 保存）
+- 監査ログ（audit.jsonl）: 作成 / 更新 / 削除 / 一括削除 / クローズ を追記記録（任意で GitHub へまとめて保存）
 - 一覧フィルタ（サイドバー）＋ クイックフィルタ（ページ内）
 - クローズ候補抽出（対応中 & 返信待ち系 & 7日以上未更新）
 - メトリクス + 棒グラフ
@@ -15,24 +15,41 @@
 - 一覧の可読性強化（本ファイルの新要素）
   * セルの折り返し / 最適幅 / 行間拡大
   * 左2列（対応状況/タスク）の固定（CSSベース）
-  * 表示モード切替：高速 or 行ハイライト or 行＋キーワード強調（Styler）
+  * 表示モード切替：高速 or 行ハイライト or 行＋キーワード強調（Styler。STYLER_MAX_ROWS 件超は高速モードへ自動切替）
   * 状態別（未対応/対応中/クローズ）＋返信待ちの淡色行ハイライト
   * （任意）セル内のキーワード強調
 
 注意:
 - Secrets の SAVE_WITH_TIME は "true/false/1/0/yes/no/on/off" を解釈。
-- GitHub 連携は GITHUB_* が必要。監査ログも保存するなら GITHUB_PATH_AUDIT を設定。
+- GitHub 連携は GITHUB_* が必要。監査ログも保存するなら GITHUB_PATH_AUDIT を設定（中身は JSONL なので .jsonl のパスを指定）。
+- 監査ログの既定は audit.jsonl（旧版は audit.csv）。旧 audit.csv が残っていれば閲覧時に先頭へ連結する（LEGACY_AUDIT_PATH）。
 """
 
 import uuid
 import base64
+import codecs
+import functools
+import hashlib
+import io
+import json
+import os
+import queue
+import random
 import re
+import tempfile
+import threading
+import time
 from datetime import datetime, date
 from zoneinfo import ZoneInfo
 
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ==============================
 #       安全なブールパーサー
@@ -50,19 +67,49 @@ def get_bool_secret(key: str, default: bool = True) -> bool:
 # ==============================
 #       設定 / 定数
 # ==============================
-AUDIT_PATH = st.secrets.get("AUDIT_PATH", "audit.csv")
-CSV_PATH = st.secrets.get("CSV_PATH", "tasks.csv")
+AUDIT_PATH = st.secrets.get("AUDIT_PATH", "audit.jsonl")
+LEGACY_AUDIT_PATH = st.secrets.get("LEGACY_AUDIT_PATH", "audit.csv")  # JSONL 化以前の監査ログ（閲覧時に先頭へ連結）
+AUDIT_FLUSH_EVERY = int(st.secrets.get("AUDIT_FLUSH_EVERY", 20))  # 監査ログの GitHub 反映間隔（件）
+TASKS_PATH = st.secrets.get("TASKS_PATH", "tasks.parquet")  # ローカル正本（Parquet / zstd）
+CSV_PATH = st.secrets.get("CSV_PATH", "tasks.csv")  # 移行元 / GitHub 連携用の CSV
+JOURNAL_PATH = st.secrets.get("JOURNAL_PATH", "tasks.journal.jsonl")  # 変更行だけを追記するジャーナル
+JOURNAL_COMPACT_BYTES = int(st.secrets.get("JOURNAL_COMPACT_BYTES", 256 * 1024))  # これを超えたら Parquet へ畳み込む
 LOCK_PATH = st.secrets.get("LOCK_PATH", "locks.csv")  # 予約（将来用）
 LOCK_TTL_MIN = int(st.secrets.get("LOCK_TTL_MIN", 10))
+STYLER_MAX_ROWS = int(st.secrets.get("STYLER_MAX_ROWS", 300))  # これを超える件数は Styler を使わず高速モードで表示
+
+GH_MAX_RETRIES = 4          # レート制限時の再試行上限
+GH_BACKOFF_BASE_SEC = 1.0   # 指数バックオフの基準秒
+GH_MAX_WAIT_SEC = 30.0      # 1 回あたりの待機上限（UI を長時間止めない）
+GH_CONFLICT_RETRIES = 3    # 競合（409/422）時にマージして再送する上限
+GH_SYNC_DEBOUNCE_SEC = 0.3  # バックグラウンド保存で同じ操作の依頼（タスク + 監査ログ）を待ち合わせる秒数
+GH_SYNC_POLL_SEC = 1.0      # 保存待ちがある間、結果欄だけを再実行して完了を確認する間隔
 
 JST = ZoneInfo("Asia/Tokyo")
 SAVE_WITH_TIME = get_bool_secret("SAVE_WITH_TIME", True)
+DATE_FMT = "%Y-%m-%d %H:%M:%S" if SAVE_WITH_TIME else "%Y-%m-%d"  # 保存・表示共通の日付書式
+
+STATUS_OPTIONS = ["未対応", "対応中", "クローズ"]
+FIXED_OWNERS = list(st.secrets.get("FIXED_OWNERS", ["都筑", "二上", "三平", "成瀬", "柿野", "花田", "武藤", "島浦"]))
 
 MANDATORY_COLS = [
     "ID", "起票日", "更新日", "タスク", "対応状況", "更新者", "次アクション", "備考", "ソース",
 ]
 
-MISSING_SET = {"", "none", "null", "nan", "na", "n/a", "-", "—"}
+MISSING_SET = frozenset({"", "none", "null", "nan", "na", "n/a", "-", "—"})
+
+# 表計算ソフトで数式として解釈される先頭文字（CSV インジェクション対策）
+CSV_INJECTION_PREFIXES = ("=", "+", "-", "@")
+# よくある列名の別名 → 正式名
+RENAME_MAP = {
+    "更新": "更新日", "最終更新": "更新日", "起票": "起票日", "作成日": "起票日",
+    "担当": "更新者", "担当者": "更新者",
+}
+TEXT_COLS = ["タスク", "対応状況", "更新者", "次アクション", "備考", "ソース"]
+
+# 返信待ち系キーワード（1 本の正規表現にまとめて 1 列 1 スキャンで判定）
+REPLY_KEYWORDS = ["返信待ち", "返信無し", "返信なし", "返信ない", "催促"]
+REPLY_RE = re.compile("|".join(re.escape(k) for k in REPLY_KEYWORDS if k), re.IGNORECASE)
 
 # ==============================
 #       ページ設定 / CSS
@@ -70,39 +117,42 @@ MISSING_SET = {"", "none", "null", "nan", "na", "n/a", "-", "—"}
 st.set_page_config(page_title="タスク管理ボード（完全版）", layout="wide")
 st.title("タスク管理ボード（完全版 / 起票日は自動・編集不可、更新者はプルダウン）")
 
-def inject_base_css():
-    """ベースの可読性向上（文字サイズ/行間・セル折り返し・行高）"""
-    st.markdown(
-        """
-        <style>
-        /* DataFrameの文字サイズ・行間 */
-        .stDataFrame table { font-size: 0.95rem; }
-        .st-emotion-cache-1gulkj5 p { line-height: 1.35; }
-
-        /* セルを折り返し可能に（一覧の長文対策） */
-        [data-testid="stDataFrame"] div[role="gridcell"] div {
-            white-space: normal !important;
-            line-height: 1.35;
-        }
+def _minify_css(css: str) -> str:
+    """コメントと余分な空白を除いた <style> ブロック（毎回の再実行で送る量を減らす）"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
 
-        /* 行高（読みやすい行間へ） */
-        [data-testid="stDataFrame"] table tbody tr td { padding-top: 10px; padding-bottom: 10px; }
-        [data-testid="stDataFrame"] table thead tr th { padding-top: 10px; padding-bottom: 10px; }
+# Streamlit は再実行で出力されなかった要素を消すため、CSS も毎回出力する（文字列の組み立ては起動時に 1 回だけ）
+BASE_CSS = _minify_css(
+    """
+    /* DataFrameの文字サイズ・行間 */
+    .stDataFrame table { font-size: 0.95rem; }
+    .st-emotion-cache-1gulkj5 p { line-height: 1.35; }
+
+    /* セルを折り返し可能に（一覧の長文対策） */
+    [data-testid="stDataFrame"] div[role="gridcell"] div {
+        white-space: normal !important;
+        line-height: 1.35;
+    }
 
-        .stMetric label { font-size: 0.9rem; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    /* 行高（読みやすい行間へ） */
+    [data-testid="stDataFrame"] table tbody tr td { padding-top: 10px; padding-bottom: 10px; }
+    [data-testid="stDataFrame"] table thead tr th { padding-top: 10px; padding-bottom: 10px; }
 
-def inject_sticky_css(first_col_width_px: int = 110, second_col_offset_px: int = 110):
-    """
-    簡易的な左2列固定（対応状況/タスク）。CSS だけで実現（環境により効かない場合あり）。
-    first_col_width_px と second_col_offset_px は実表示に合わせて微調整可。
+    .stMetric label { font-size: 0.9rem; }
     """
-    st.markdown(
+)
+
+def inject_base_css():
+    """ベースの可読性向上（文字サイズ/行間・セル折り返し・行高）"""
+    st.markdown(BASE_CSS, unsafe_allow_html=True)
+
+@functools.lru_cache(maxsize=8)
+def _sticky_css(first_col_width_px: int, second_col_offset_px: int) -> str:
+    return _minify_css(
         f"""
-        <style>
         /* 1列目（対応状況）を固定 */
         [data-testid="stDataFrame"] table tbody tr td:nth-child(1),
         [data-testid="stDataFrame"] table thead tr th:nth-child(1) {{
@@ -117,11 +167,16 @@ def inject_sticky_css(first_col_width_px: int = 110, second_col_offset_px: int =
         }}
         /* 1列目の幅を目安として指定（表ヘッダのレイアウトと合わせる） */
         [data-testid="stDataFrame"] table thead tr th:nth-child(1) {{ min-width: {first_col_width_px}px; }}
-        </style>
-        """,
-        unsafe_allow_html=True,
+        """
     )
 
+def inject_sticky_css(first_col_width_px: int = 110, second_col_offset_px: int = 110):
+    """
+    簡易的な左2列固定（対応状況/タスク）。CSS だけで実現（環境により効かない場合あり）。
+    first_col_width_px と second_col_offset_px は実表示に合わせて微調整可。
+    """
+    st.markdown(_sticky_css(first_col_width_px, second_col_offset_px), unsafe_allow_html=True)
+
 inject_base_css()
 
 # ==============================
@@ -131,34 +186,77 @@ def now_jst() -> datetime:
     return datetime.now(JST)
 
 def now_jst_str() -> str:
-    fmt = "%Y-%m-%d %H:%M:%S" if SAVE_WITH_TIME else "%Y-%m-%d"
-    return now_jst().strftime(fmt)
+    return now_jst().strftime(DATE_FMT)
 
 def today_jst() -> date:
     return now_jst().date()
 
+def now_ts_jst() -> pd.Timestamp:
+    """DataFrame 格納用の“いま”（日付列は tz-naive の JST で統一）"""
+    return pd.Timestamp(now_jst()).tz_localize(None)
+
 # ==============================
 #       文字/欠損ユーティリティ
 # ==============================
-def _ensure_str(x) -> str:
-    return "" if x is None else str(x)
-
-def _is_missing(x) -> bool:
-    s = _ensure_str(x).strip().lower()
-    return s in MISSING_SET
+def _clean_text(s: pd.Series) -> pd.Series:
+    """文字列化し、欠損表現（MISSING_SET）を空文字に（列単位で一括処理）"""
+    s = s.astype("string").fillna("")
+    return s.mask(s.str.strip().str.lower().isin(MISSING_SET), "").astype(str)
 
 # ==============================
 #       データ正規化
 # ==============================
+# タイムゾーン付きの日時（時刻の後ろが Z / UTC / ±hh:mm など）
+_TZ_SUFFIX_RE = re.compile(r":\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|UTC|GMT|[+-]\d{2}(?::?\d{2})?)$", re.IGNORECASE)
+
+def _to_naive_jst(s: pd.Series, fmt: str) -> pd.Series:
+    """
+    pd.to_datetime（errors="coerce"）の結果を JST の tz-naive にそろえる。
+    タイムゾーン付きの値だけ utc=True で解釈する（+09:00 と Z の混在や tz なしとの混在は、一括だと ValueError になる）。
+    """
+    aware = s.astype(str).str.contains(_TZ_SUFFIX_RE)
+    out = pd.to_datetime(s.mask(aware), format=fmt, errors="coerce")
+    if getattr(out.dt, "tz", None) is not None:
+        out = out.dt.tz_convert(JST).dt.tz_localize(None)
+    if aware.any():
+        out[aware] = pd.to_datetime(s[aware], format=fmt, errors="coerce", utc=True).dt.tz_convert(JST).dt.tz_localize(None)
+    return out
+
+def _parse_dates(s: pd.Series) -> pd.Series:
+    """
+    日付列の解釈。ISO 形式は日付のみ / 日時が混在していても一括で解釈し、
+    それ以外の書式の値だけを個別に解釈する（先頭行の書式に合わない値が NaT → “いま”で補完、を防ぐ）。
+    タイムゾーン付きの値は JST に直して tz-naive にそろえる（以降の比較・表示でタイムゾーンを気にしない）。
+    """
+    out = _to_naive_jst(s, "ISO8601")
+    rest = out.isna() & s.notna() & s.astype(str).str.strip().ne("")
+    if rest.any():
+        out[rest] = _to_naive_jst(s[rest], "mixed")
+    return out
+
+def _is_canonical(df: pd.DataFrame) -> bool:
+    """このアプリ自身が保存した形（列・ID・型がそろっている）か。Parquet の通常読み込みは常にこちら"""
+    return (
+        set(df.columns) == set(MANDATORY_COLS)
+        and df["ID"].is_unique
+        and not df["ID"].isna().any()
+        and (df["ID"].astype(str).str.len() > 0).all()
+        and pd.api.types.is_datetime64_any_dtype(df["起票日"])
+        and pd.api.types.is_datetime64_any_dtype(df["更新日"])
+        and not df[TEXT_COLS].isna().any().any()
+    )
+
 def _normalize_df(df: pd.DataFrame) -> pd.DataFrame:
+    # 既に正規形なら重い正規化は省略（カテゴリ化だけ行う）
+    if _is_canonical(df):
+        df["対応状況"] = _to_category(df["対応状況"], STATUS_OPTIONS)
+        df["更新者"] = _to_category(df["更新者"], FIXED_OWNERS)
+        return df.reset_index(drop=True)
+
     # 列名の単純正規化（全角スペース→半角、前後空白除去）
     df.columns = [c.replace("\u3000", " ").strip() for c in df.columns]
     # よくある別名の統一
-    rename_map = {
-        "更新": "更新日", "最終更新": "更新日", "起票": "起票日", "作成日": "起票日",
-        "担当": "更新者", "担当者": "更新者"
-    }
-    df.columns = [rename_map.get(c, c) for c in df.columns]
+    df.columns = [RENAME_MAP.get(c, c) for c in df.columns]
 
     # 必須列の追加
     for col in MANDATORY_COLS:
@@ -166,217 +264,983 @@ def _normalize_df(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = ""
 
     # ID 正規化（空/重複を解消）
-    df["ID"] = df["ID"].astype(str).replace({"nan": "", "None": ""})
+    df["ID"] = df["ID"].astype("string").fillna("").replace({"nan": "", "None": ""}).astype(str)
     mask_empty = df["ID"].str.strip().eq("")
-    if mask_empty.any():
-        df.loc[mask_empty, "ID"] = [str(uuid.uuid4()) for _ in range(mask_empty.sum())]
-    dup_mask = df["ID"].duplicated(keep="first")
-    if dup_mask.any():
-        df.loc[dup_mask, "ID"] = [str(uuid.uuid4()) for _ in range(dup_mask.sum())]
+    # 空の ID と（空以外で）2 回目以降に出てくる ID をまとめて 1 回で振り直す
+    need_id = mask_empty | (df["ID"].duplicated(keep="first") & ~mask_empty)
+    n_new = int(need_id.sum())
+    if n_new:
+        df.loc[need_id, "ID"] = [str(uuid.uuid4()) for _ in range(n_new)]
 
     # 文字列列の正規化
-    for col in ["タスク", "対応状況", "更新者", "次アクション", "備考", "ソース"]:
-        df[col] = df[col].apply(lambda x: "" if _is_missing(x) else _ensure_str(x))
+    for col in TEXT_COLS:
+        df[col] = _clean_text(df[col])
 
     # 日付列
     for col in ["起票日", "更新日"]:
-        df[col] = pd.to_datetime(df[col], errors="coerce")
+        df[col] = _parse_dates(df[col])
+
+    # 低カーディナリティ列はカテゴリ型に（メモリ削減 / 比較・集計の高速化）。
+    # UI から書き込み得る値（状態の選択肢・固定担当者）は先にカテゴリへ含めておく。
+    df["対応状況"] = _to_category(df["対応状況"], STATUS_OPTIONS)
+    df["更新者"] = _to_category(df["更新者"], FIXED_OWNERS)
 
     return df.reset_index(drop=True)
 
+def _to_category(s: pd.Series, known: list) -> pd.Series:
+    values = s.astype(str)
+    categories = list(dict.fromkeys([*known, *values.unique().tolist()]))
+    return pd.Series(pd.Categorical(values, categories=categories), index=s.index, name=s.name)
+
 # ==============================
 #       日付の安全弁
 # ==============================
 def safety_autofill_all(df: pd.DataFrame) -> pd.DataFrame:
-    now_ts = pd.Timestamp(now_jst())
-    # 起票日は欠損のみ補完
-    df["起票日"] = df["起票日"].apply(
-        lambda x: now_ts if pd.isna(pd.to_datetime(x, errors="coerce")) else pd.to_datetime(x, errors="coerce")
-    )
-    # 更新日は欠損なら補完
-    df["更新日"] = df["更新日"].apply(
-        lambda x: now_ts if pd.isna(pd.to_datetime(x, errors="coerce")) else pd.to_datetime(x, errors="coerce")
-    )
-    return df
-
-def format_ts(dt) -> str:
-    """CSV 保存時の日付フォーマット統一。NaT は“いま”で補完。"""
-    if pd.isna(dt):
-        dt = pd.Timestamp(now_jst())
-    else:
-        dt = pd.to_datetime(dt, errors="coerce")
-        if pd.isna(dt):
-            dt = pd.Timestamp(now_jst())
-    return dt.strftime("%Y-%m-%d %H:%M:%S" if SAVE_WITH_TIME else "%Y-%m-%d")
+    """
+    起票日・更新日の欠損のみ“いま”で補完した DataFrame を返す（入力は変更しない）。
+    どちらも日時型で欠損が無ければ何もせずそのまま返す。
+    """
+    cols = ("起票日", "更新日")
+    if all(pd.api.types.is_datetime64_any_dtype(df[c]) and df[c].notna().all() for c in cols):
+        return df
+    now_ts = now_ts_jst()
+    return df.assign(**{
+        col: pd.to_datetime(df[col], errors="coerce").fillna(now_ts)
+        for col in cols
+    })
 
 # ==============================
-#       CSV ロード/保存
+#       タスク ロード/保存
 # ==============================
-@st.cache_data(ttl=10)
-def load_tasks() -> pd.DataFrame:
+def _read_csv(src) -> pd.DataFrame:
+    """タスク CSV（パス or バイナリストリーム）を全列文字列で読む。pyarrow の CSV パーサ（マルチスレッド）、使えない環境では既定の C パーサへ"""
+    kwargs = dict(encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    try:
+        return pd.read_csv(src, engine="pyarrow", **kwargs)
+    except (ImportError, ValueError):
+        if hasattr(src, "seek"):
+            src.seek(0)
+        return pd.read_csv(src, **kwargs)
+
+def _read_tasks_file() -> tuple:
+    """
+    Parquet（ローカル正本）を優先して読む。戻り値は (DataFrame, CSV から読んだか)。
+    Parquet が無い、または CSV の方が新しい（初回移行 / GitHub 側の更新を取り込んだ）場合は CSV から読む。
+    """
+    if os.path.exists(CSV_PATH) and not (
+        os.path.exists(TASKS_PATH) and os.path.getmtime(CSV_PATH) <= os.path.getmtime(TASKS_PATH)
+    ):
+        return _read_csv(CSV_PATH), True
+    if os.path.exists(TASKS_PATH):
+        return pd.read_parquet(TASKS_PATH), False
+    return pd.DataFrame(columns=MANDATORY_COLS), False
+
+def _mtime_ns(path: str) -> int:
     try:
-        df = pd.read_csv(CSV_PATH, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+def _replay_journal(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    スナップショットにジャーナルを順に適用（ID ごとに最後の操作が勝つ）。
+    既存行は元の位置のまま置き換え、新しい ID は末尾に足す。ジャーナルが無ければそのまま返す。
+    "merge"（GitHub 競合マージで取り込んだリモート行）は、その時点の行より更新日が新しい場合だけ採用する。
+    """
+    last = {}
+    snapshot_updated = None
+    try:
+        with open(JOURNAL_PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 書き込み途中で落ちた末尾行は捨てる
+                row = rec.get("row") or {}
+                rid = row.get("ID")
+                if not rid:
+                    continue
+                action = rec.get("action")
+                if action == "merge":
+                    if rid in last:
+                        if last[rid] is None:
+                            continue  # 手元で削除済み
+                        current = last[rid].get("更新日")
+                    else:
+                        if snapshot_updated is None:
+                            snapshot_updated = dict(zip(df["ID"], df["更新日"])) if "ID" in df.columns else {}
+                        current = snapshot_updated.get(rid)
+                    current = pd.to_datetime(current, errors="coerce")
+                    if pd.notna(current) and not pd.to_datetime(row.get("更新日"), errors="coerce") > current:
+                        continue  # マージ後に手元で更新された行はそのまま
+                last[rid] = row if action in ("upsert", "merge") else None
     except FileNotFoundError:
-        df = pd.DataFrame(columns=MANDATORY_COLS)
-    df = _normalize_df(df)
+        return df
+    if not last:
+        return df
+    upserts = _normalize_df(pd.DataFrame([r for r in last.values() if r is not None], columns=MANDATORY_COLS))
+    merged = pd.concat([df, upserts], ignore_index=True)
+    merged = merged[~merged["ID"].isin([k for k, v in last.items() if v is None])]
+    order = pd.unique(merged["ID"])
+    out = merged.drop_duplicates("ID", keep="last").set_index("ID").loc[order].reset_index()
+    return out[merged.columns]
+
+@st.cache_resource
+def _journal_lock() -> threading.RLock:
+    """スナップショット / ジャーナルの書き込みを直列化するロック（全セッション + GitHub 同期スレッドで共有）"""
+    return threading.RLock()
+
+def _load_tasks_from_disk() -> pd.DataFrame:
+    """スナップショットを正規化してからジャーナルを再生し、安全弁まで済ませた DataFrame を返す"""
+    with _journal_lock():
+        return _load_tasks_from_disk_locked()
+
+def _load_tasks_from_disk_locked() -> pd.DataFrame:
+    raw, from_csv = _read_tasks_file()
+    # _normalize_df は入力を書き換えるので、ID は正規化の前に控えておく
+    raw_ids = raw["ID"].astype(str).to_numpy() if "ID" in raw.columns else None
+    snapshot = _normalize_df(raw)
+    repaired = raw_ids is None or not np.array_equal(snapshot["ID"].astype(str).to_numpy(), raw_ids)
+    if from_csv:
+        # ジャーナルは以前の Parquet に対する差分なので、取り込んだ CSV には重ねない
+        df = snapshot
+    else:
+        # 列名の揺れ（担当 / 作成日 など）はスナップショット側で正規化済みなので、正規名のジャーナル行とそのまま突き合わせられる
+        df = _normalize_df(_replay_journal(snapshot))
+    if from_csv or repaired:
+        # CSV の取り込みは一度だけ Parquet へ書いて、以降の読み込みで CSV を解析し直さない。
+        # ID を補った行は読み込むたびに別の ID になるので、同じく書き戻して固定する
+        save_tasks(df)
+        if os.path.exists(JOURNAL_PATH):
+            os.remove(JOURNAL_PATH)
     df = safety_autofill_all(df)
     return df
 
+def _journal_stat() -> tuple:
+    """ジャーナルの (更新時刻, サイズ)。無ければ (0, 0)"""
+    try:
+        stat = os.stat(JOURNAL_PATH)
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def tasks_version() -> tuple:
+    """タスクデータの版（Parquet / CSV の更新時刻とジャーナルの更新時刻・サイズ）。派生データのキャッシュキーにも使う。"""
+    return (_mtime_ns(TASKS_PATH), _mtime_ns(CSV_PATH), _journal_stat())
+
+@st.cache_resource
+def _task_store() -> dict:
+    """
+    読み込み済みタスクのプロセス内ストア（全セッション共有）。
+    版（tasks_version()）が変わらない限りディスクから読み直さない。保存した側は remember_tasks() で直接差し替える。
+    """
+    return {"version": None, "df": None, "lock": threading.Lock()}
+
+def load_tasks(version: tuple = None) -> pd.DataFrame:
+    """現在の版のタスクを返す（呼び出し側で書き換えてよいようにコピーを渡す）"""
+    version = version or tasks_version()
+    store = _task_store()
+    with store["lock"]:
+        if store["version"] != version:
+            store["df"] = _load_tasks_from_disk()
+            store["version"] = version
+        return store["df"].copy()
+
+def remember_tasks(df: pd.DataFrame, base_version: tuple, journal_state: tuple):
+    """
+    保存直後の df を、ジャーナル追記後の版の読み込み結果としてストアへ入れる（次の再実行で読み直さない）。
+    journal_state は append_journal() が返す（追記直前, 追記直後）のジャーナル状態。
+    base_version（df を読み込んだ版）からスナップショットが書き換わっていたり（畳み込み）、
+    自分の追記より前に他セッション / GitHub 同期スレッドの追記があったりしたら、ストアは捨てて読み直させる。
+    """
+    before, after = journal_state
+    if tasks_version()[:2] != base_version[:2] or before != base_version[2]:
+        forget_tasks()
+        return
+    # 自分の追記の後に別の追記があれば現在の版とずれるので、次の load_tasks で読み直される
+    version = base_version[:2] + (after,)
+    df = safety_autofill_all(_normalize_df(df.copy()))
+    store = _task_store()
+    with store["lock"]:
+        store["df"] = df
+        store["version"] = version
+
+def forget_tasks():
+    """ストアを無効化（次の load_tasks でディスクから読み直す）"""
+    store = _task_store()
+    with store["lock"]:
+        store["version"] = None
+
+def _atomic_write(path: str, write, durable: bool = True):
+    """
+    同じディレクトリの一時ファイルへ write(tmp) で書き出し、os.replace で差し替える（途中で落ちても元ファイルは壊れない）。
+    durable=True なら差し替え前に fsync し、電源断でも新しい内容が残るようにする。
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp)
+        if durable:
+            with open(tmp, "rb") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
 def save_tasks(df: pd.DataFrame):
-    """保存前に安全弁をかけ、CSVへ書き出し"""
-    df_out = safety_autofill_all(df.copy())
-    for col in ["起票日", "更新日"]:
-        df_out[col] = pd.to_datetime(df_out[col], errors="coerce").apply(format_ts)
-    df_out.to_csv(CSV_PATH, index=False, encoding="utf-8-sig")
+    """保存前に安全弁をかけ、Parquet（zstd）へ原子的に書き出し。日付は型付きのまま保存する。"""
+    df_out = safety_autofill_all(df)
+    if not SAVE_WITH_TIME:
+        df_out = df_out.assign(**{col: df_out[col].dt.floor("D") for col in ("起票日", "更新日")})
+    _atomic_write(TASKS_PATH, lambda tmp: df_out.to_parquet(tmp, compression="zstd", index=False))
+
+def append_journal(action: str, rows: list):
+    """
+    変更のあった行だけをジャーナルへ 1 行ずつ追記（action: "upsert" / "merge" は行全体、"delete" は ID だけ）。
+    1 件の追加・更新・削除でテーブル全体を書き直さない。
+    保存のたびに fsync はしない（畳み込み時の Parquet 書き出しは durable）。途中で切れた末尾行は再生時に捨てる。
+    戻り値は（追記直前, 追記直後）のジャーナル状態（remember_tasks 用）。
+    """
+    ts = now_jst_str()
+    with _journal_lock():
+        before = _journal_stat()
+        if rows:
+            with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+                f.writelines(
+                    json.dumps({"ts": ts, "action": action, "row": row}, ensure_ascii=False, default=str) + "\n"
+                    for row in rows
+                )
+        return before, _journal_stat()
+
+def journal_rows(df: pd.DataFrame, pos: list) -> list:
+    """append_journal 用に、指定位置（pos_by_id で引いた行番号）の行を dict のリストで取り出す"""
+    return df.iloc[pos][MANDATORY_COLS].to_dict("records")
+
+def maybe_compact_journal():
+    """
+    ジャーナルが JOURNAL_COMPACT_BYTES を超えたら、ディスク上の全件（スナップショット + ジャーナル）を Parquet に畳み込んでジャーナルを空にする。
+    手元の df ではなくディスクから読み直すので、他セッションや GitHub 同期スレッドの追記も失わない。
+    """
+    with _journal_lock():
+        if os.path.exists(JOURNAL_PATH) and os.path.getsize(JOURNAL_PATH) > JOURNAL_COMPACT_BYTES:
+            save_tasks(_load_tasks_from_disk_locked())
+            os.remove(JOURNAL_PATH)
+
+def sanitize_df_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ダウンロード用 CSV の数式インジェクション対策。
+    危険な先頭文字で始まるセルに ' を前置（列単位のベクトル演算）。入力は変更しない。
+    """
+    def _sanitize(s: pd.Series):
+        s = s.astype(str)
+        return np.where(s.str.startswith(CSV_INJECTION_PREFIXES), "'" + s, s)
+    return df.assign(**{c: _sanitize(df[c]) for c in TEXT_COLS if c in df.columns})
+
+def tasks_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV エクスポート（GitHub 連携用）。日付は安全弁で NaT を埋めたうえで一括で文字列化する。"""
+    df_out = safety_autofill_all(df)
+    df_out = df_out.assign(**{col: df_out[col].dt.strftime(DATE_FMT) for col in ("起票日", "更新日")})
+    # pyarrow の CSV ライタ（C++）でバイト列へ直接書き出す。Excel 向けに従来どおり BOM を付ける
+    buf = io.BytesIO()
+    buf.write(codecs.BOM_UTF8)
+    pacsv.write_csv(pa.Table.from_pandas(df_out, preserve_index=False), buf)
+    return buf.getvalue()
+
+def _read_csv_bytes(content: bytes) -> pd.DataFrame:
+    return _read_csv(io.BytesIO(content))
+
+def merge_tasks_csv(remote: bytes, local: bytes, base: bytes = None) -> bytes:
+    """
+    GitHub 保存が競合したときのマージ（ID 単位で更新日の新しい方を採用、同時刻ならローカル優先）。
+    base（前回こちらが保存した内容）が分かれば、どちらか一方で削除された ID は削除として扱う。
+    リモート側を採用した行と削除になった行はローカルのジャーナルにも追記する（次回の保存でリモートの更新を消さないため）。
+    スナップショットは書き換えないので、マージ後に手元で更新した行は再生時にそのまま残る。
+    """
+    remote_df = _normalize_df(_read_csv_bytes(remote))
+    local_df = _normalize_df(_read_csv_bytes(local))
+    merged = (
+        pd.concat([remote_df.assign(_remote=True), local_df.assign(_remote=False)], ignore_index=True)
+        .sort_values("更新日", kind="stable")
+        .drop_duplicates("ID", keep="last")
+    )
+    if base is not None:
+        base_ids = set(_read_csv_bytes(base)["ID"])
+        deleted = (base_ids - set(local_df["ID"])) | (base_ids - set(remote_df["ID"]))
+        merged = merged[~merged["ID"].isin(deleted)]
+    merged = merged.sort_values("起票日", kind="stable")
+    from_remote = np.flatnonzero(merged["_remote"].to_numpy(bool)).tolist()
+    merged = _normalize_df(merged.drop(columns="_remote"))
+    append_journal("merge", journal_rows(merged, from_remote))
+    append_journal("delete", [{"ID": tid} for tid in local_df["ID"][~local_df["ID"].isin(merged["ID"])]])
+    return tasks_to_csv_bytes(merged)
 
 # ==============================
 #       GitHub 連携
 # ==============================
-def save_to_github_file(local_path: str, remote_path: str, commit_message: str, debug: bool = False) -> bool:
+def _git_blob_sha(content: bytes) -> str:
+    """git の blob SHA-1（Contents API が返す sha と同じ計算）"""
+    return hashlib.sha1(b"blob " + str(len(content)).encode() + b"\0" + content).hexdigest()
+
+@st.cache_resource
+def _gh_session() -> requests.Session:
+    """GitHub API 用のセッション（接続プールを再実行・セッション間で共有し、TLS ハンドシェイクを使い回す）"""
+    s = requests.Session()
+    s.headers.update({
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+        "User-Agent": "streamlit-app",
+    })
+    # 接続エラーと 5xx はアダプタ側で軽く再試行（429/403 のレート制限は _request_with_backoff が担当）。
+    # Git Data API の POST（blob/tree/commit）は内容で決まるオブジェクトを作るだけ、ref の PATCH は force なしなので再送しても安全
+    retry = Retry(
+        total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "PUT", "POST", "PATCH"}), raise_on_status=False,
+    )
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return s
+
+@st.cache_resource
+def _gh_state() -> dict:
+    """
+    GitHub 連携の共有状態（バックグラウンド保存スレッドからも参照するため session_state ではなくプロセス共有）。
+    - sha: remote_path → 直近に PUT 成功したときのリモート sha
+    - etag: ディレクトリ → (ETag, {path: sha})。一覧の GET を条件付きにし、304 ならこの sha を使う
+    - b64: blob sha → base64 済みの内容（同一内容の再送・競合時の再試行でエンコードし直さない）
+    - remaining / reset: X-RateLimit-Remaining / X-RateLimit-Reset
+    """
+    return {"sha": {}, "etag": {}, "b64": {}, "remaining": None, "reset": None}
+
+GH_SESSION = _gh_session()
+GH_STATE = _gh_state()
+
+def _gh_conf() -> tuple:
+    """Secrets から接続情報を取り出す（スレッドへ渡せるよう dict 化）。戻り値: (conf, 不足キー一覧)"""
     required_keys = ["GITHUB_TOKEN", "GITHUB_OWNER", "GITHUB_REPO"]
     missing = [k for k in required_keys if k not in st.secrets]
-    branch = st.secrets.get("GITHUB_BRANCH", "main")
     if missing:
-        st.error(f"Secrets が不足しています: {missing}（Manage app → Settings → Secrets を確認）")
-        return False
+        return None, missing
+    conf = {
+        "token": st.secrets["GITHUB_TOKEN"],
+        "owner": st.secrets["GITHUB_OWNER"],
+        "repo": st.secrets["GITHUB_REPO"],
+        "branch": st.secrets.get("GITHUB_BRANCH", "main"),
+    }
+    return conf, []
+
+def _retry_after(resp: requests.Response) -> float:
+    """Retry-After / X-RateLimit-Reset から待機秒数を推定（ヒント無しは 0）"""
+    h = resp.headers
+    try:
+        if "Retry-After" in h:
+            return float(h["Retry-After"])
+        if h.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in h:
+            return max(0.0, float(h["X-RateLimit-Reset"]) - time.time())
+    except ValueError:
+        pass
+    return 0.0
 
-    token = st.secrets["GITHUB_TOKEN"]
-    owner = st.secrets["GITHUB_OWNER"]
-    repo = st.secrets["GITHUB_REPO"]
-    path = remote_path
+def _is_rate_limited(resp: requests.Response) -> bool:
+    """429、または 403 のうちプライマリ/セカンダリのレート制限によるもの"""
+    if resp.status_code == 429:
+        return True
+    if resp.status_code == 403:
+        return resp.headers.get("X-RateLimit-Remaining") == "0" or "rate limit" in resp.text.lower()
+    return False
 
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+def _request_with_backoff(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    GitHub API 呼び出し（適応的バックオフ付き）。
+    - 残量（X-RateLimit-Remaining）がほぼ尽きていればリセットまで事前に待つ
+    - レート制限応答は Retry-After と指数バックオフ（ジッター付き）の大きい方だけ待って再試行
+    """
+    remaining = GH_STATE["remaining"]
+    reset_ts = GH_STATE["reset"]
+    if remaining is not None and remaining < 5 and reset_ts:
+        time.sleep(min(max(0.0, reset_ts - time.time()), GH_MAX_WAIT_SEC))
+
+    for attempt in range(GH_MAX_RETRIES + 1):
+        resp = GH_SESSION.request(method, url, **kwargs)
+        try:
+            if "X-RateLimit-Remaining" in resp.headers:
+                GH_STATE["remaining"] = int(resp.headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in resp.headers:
+                GH_STATE["reset"] = float(resp.headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+        if not _is_rate_limited(resp) or attempt == GH_MAX_RETRIES:
+            return resp
+        wait = max(_retry_after(resp), GH_BACKOFF_BASE_SEC * 2 ** attempt) + random.uniform(0, 0.3)
+        time.sleep(min(wait, GH_MAX_WAIT_SEC))
+    return resp
+
+B64_CACHE_MAX = 4  # base64 キャッシュの保持件数（古いものから捨てる）
+
+def _b64_for(content: bytes, blob_sha: str) -> bytes:
+    """内容の base64（blob sha をキーにメモ化）"""
+    cache = GH_STATE["b64"]
+    b64 = cache.get(blob_sha)
+    if b64 is None:
+        b64 = base64.b64encode(content)
+        cache[blob_sha] = b64
+        while len(cache) > B64_CACHE_MAX:
+            cache.pop(next(iter(cache)), None)
+    return b64
+
+class _PutBody:
+    """
+    Contents API の PUT / Git Data API の blob 作成ボディ（JSON）を分割生成する iterable。
+    JSON 文字列を丸ごと作らず、base64 済みの内容をスライスで流す。長さは事前計算して Content-Length 付きで送る。
+    """
+    CHUNK = 64 * 1024
+
+    def __init__(self, meta: dict, b64: bytes):
+        self.head = (json.dumps(meta)[:-1] + ', "content": "').encode("utf-8")
+        self.b64 = memoryview(b64)
+
+    def __len__(self) -> int:
+        return len(self.head) + len(self.b64) + len(b'"}')
+
+    def __iter__(self):
+        yield self.head
+        for i in range(0, len(self.b64), self.CHUNK):
+            yield self.b64[i:i + self.CHUNK]
+        yield b'"}'
+
+def _fetch_blob(conf: dict, headers: dict, sha: str) -> bytes:
+    """blob の内容を取得（Contents API と違い 1MB を超えるファイルでも内容が返る）"""
+    url = f"https://api.github.com/repos/{conf['owner']}/{conf['repo']}/git/blobs/{sha}"
+    r = _request_with_backoff("GET", url, headers=headers, timeout=20)
+    r.raise_for_status()
+    return base64.b64decode(r.json()["content"])
+
+def _pushed_content(sha: str):
+    """直近にこちらが送った内容（base64 キャッシュに残っていれば）。競合マージの共通祖先に使う"""
+    b64 = GH_STATE["b64"].get(sha) if sha else None
+    return base64.b64decode(b64) if b64 is not None else None
+
+def _push_to_github(content: bytes, remote_path: str, commit_message: str, conf: dict,
+                    use_cache: bool = True, log: list = None, merge=None) -> tuple:
+    """
+    GitHub へ 1 ファイル保存（UI には触れない。バックグラウンドスレッドからも呼べる）。
+    merge(remote, local, base) -> bytes を渡すと、競合時はリモートの最新とマージして再送する（上限 GH_CONFLICT_RETRIES 回）。
+    戻り値: (成否, "success" | "warning" | "error", メッセージ)
+    """
+    url = f"https://api.github.com/repos/{conf['owner']}/{conf['repo']}/contents/{remote_path}"
     headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "User-Agent": "streamlit-app",
+        "Authorization": f"Bearer {conf['token']}",
+        "Content-Type": "application/json",
     }
-    try:
-        r = requests.get(url, headers=headers, params={"ref": branch}, timeout=20)
-        if debug:
-            st.write({"GET_status": r.status_code, "GET_text": r.text[:300]})
-        latest_sha = r.json().get("sha") if r.status_code == 200 else None
+    branch = conf["branch"]
+    # 直近に PUT 成功したときのリモート sha を再利用（診断時は使わず毎回 GET）
+    known_sha = GH_STATE["sha"].get(remote_path) if use_cache else None
+    blob_sha = _git_blob_sha(content)
+    if known_sha and known_sha == blob_sha:
+        return True, "success", "GitHubは最新です（変更なし）"
+
+    def _fetch_sha():
+        # ファイル本体ではなく親ディレクトリの一覧から sha を取る（一覧は内容を含まないのでファイルサイズに依存しない）。
+        # 前回の ETag があれば条件付き GET（304 はレート制限にも数えられない）
+        parent = remote_path.rsplit("/", 1)[0] if "/" in remote_path else ""
+        dir_url = f"https://api.github.com/repos/{conf['owner']}/{conf['repo']}/contents/{parent}"
+        cached = GH_STATE["etag"].get(parent) if use_cache else None
+        get_headers = {**headers, "If-None-Match": cached[0]} if cached else headers
+        r = _request_with_backoff("GET", dir_url, headers=get_headers, params={"ref": branch}, timeout=20)
+        if log is not None:
+            log.append({"GET_status": r.status_code, "GET_text": r.text[:300]})
+        if r.status_code == 304 and cached:
+            return cached[1].get(remote_path)
+        if r.status_code != 200 or not isinstance(r.json(), list):
+            return None
+        shas = {e["path"]: e["sha"] for e in r.json()}
+        if r.headers.get("ETag"):
+            GH_STATE["etag"][parent] = (r.headers["ETag"], shas)
+        return shas.get(remote_path)
 
-        with open(local_path, "rb") as f:
-            content_b64 = base64.b64encode(f.read()).decode("utf-8")
+    try:
+        latest_sha = known_sha or _fetch_sha()
 
         ts = now_jst().strftime("%Y-%m-%d %H:%M:%S %Z")
         payload = {
             "message": f"{commit_message} ({ts})",
-            "content": content_b64,
             "branch": branch,
             "committer": {"name": "Streamlit App", "email": "noreply@example.com"},
         }
         if latest_sha:
             payload["sha"] = latest_sha
 
-        put = requests.put(url, headers=headers, json=payload, timeout=20)
-        if debug:
-            st.write({"PUT_status": put.status_code, "PUT_text": put.text[:500]})
+        b64 = _b64_for(content, blob_sha)
+        put = _request_with_backoff("PUT", url, headers=headers, data=_PutBody(payload, b64), timeout=20)
+        if log is not None:
+            log.append({"PUT_status": put.status_code, "PUT_text": put.text[:500]})
+
+        base = _pushed_content(known_sha) if merge is not None else None
+        for attempt in range(GH_CONFLICT_RETRIES):
+            if put.status_code not in (409, 422):
+                break
+            # リモートが先に更新されている。マージ関数があれば最新の内容とマージ、無ければ
+            # キャッシュした sha が古かった場合に限り最新 sha で 1 回だけ再送（従来どおり上書き）
+            if merge is None and (attempt > 0 or not known_sha):
+                break
+            GH_STATE["sha"].pop(remote_path, None)
+            latest_sha = _fetch_sha()
+            if latest_sha:
+                payload["sha"] = latest_sha
+                if merge is not None:
+                    content = merge(_fetch_blob(conf, headers, latest_sha), content, base)
+                    blob_sha = _git_blob_sha(content)
+                    b64 = _b64_for(content, blob_sha)
+            else:
+                payload.pop("sha", None)
+            put = _request_with_backoff("PUT", url, headers=headers, data=_PutBody(payload, b64), timeout=20)
+            if log is not None:
+                log.append({"PUT_retry_status": put.status_code, "PUT_retry_text": put.text[:500]})
 
         if put.status_code in (200, 201):
-            st.toast("GitHubへ保存完了", icon="✅")
-            return True
-        elif put.status_code == 422:
-            st.warning("他の更新と競合しました。最新を読み直してから再保存してください。")
-            return False
-        elif put.status_code == 401:
-            st.error("401 Unauthorized: トークン無効。新しいPATをSecretsへ。")
-        elif put.status_code == 403:
-            st.error("403 Forbidden: 権限不足/保護ルール。PAT権限『Contents: Read and write』やブランチ保護を確認。")
-        elif put.status_code == 404:
-            st.error("404 Not Found: OWNER/REPO/PATH/BRANCH を再確認。")
-        elif put.status_code == 429:
-            st.error("429 Too Many Requests: レート制限。しばらく待って再試行してください。")
-        else:
-            st.error(f"GitHub保存失敗: {put.status_code} {put.text[:300]}")
-        return False
+            GH_STATE["sha"][remote_path] = (put.json().get("content") or {}).get("sha")
+            return True, "success", "GitHubへ保存完了"
+        if put.status_code in (409, 422):
+            GH_STATE["sha"].pop(remote_path, None)
+            return False, "warning", "他の更新と競合しました。最新を読み直してから再保存してください。"
+        return False, "error", _gh_error_message(put)
+    except Exception as e:
+        return False, "error", f"GitHub保存中に例外: {e}"
+
+def _push_many_to_github(files: dict, commit_message: str, conf: dict, merges: dict = None) -> tuple:
+    """
+    複数ファイル（remote_path → 内容）を Git Data API で 1 コミットにまとめて保存。
+    blob 作成 → tree 作成（base_tree 指定）→ commit 作成 → ブランチの ref 更新。
+    merges（remote_path → merge 関数）があるファイルは、先頭の tree 上の sha が前回こちらが送ったものと
+    違えば（他から更新されていれば）リモートの内容とマージしてから載せる。
+    ref 更新が fast-forward にならない（他の更新が先に入った）ときは最新の先頭から作り直す（上限 GH_CONFLICT_RETRIES 回）。
+    戻り値は _push_to_github と同じ。
+    """
+    files = dict(files)
+    merges = merges or {}
+    api = f"https://api.github.com/repos/{conf['owner']}/{conf['repo']}/git"
+    headers = {
+        "Authorization": f"Bearer {conf['token']}",
+        "Content-Type": "application/json",
+    }
+    ref = f"heads/{conf['branch']}"
+    blob_shas = {remote: _git_blob_sha(content) for remote, content in files.items()}
+    known_shas = {remote: GH_STATE["sha"].get(remote) for remote in files}
+    changed = [remote for remote in files if known_shas[remote] != blob_shas[remote]]
+    if not changed:
+        return True, "success", "GitHubは最新です（変更なし）"
+    bases = {remote: _pushed_content(known_shas[remote]) for remote in changed if remote in merges}
+
+    try:
+        # blob は作り直しでも使い回せるので先に 1 回だけ作る
+        for remote in changed:
+            r = _request_with_backoff(
+                "POST", f"{api}/blobs", headers=headers,
+                data=_PutBody({"encoding": "base64"}, _b64_for(files[remote], blob_shas[remote])), timeout=20,
+            )
+            if r.status_code != 201:
+                return False, "error", _gh_error_message(r)
+        ts = now_jst().strftime("%Y-%m-%d %H:%M:%S %Z")
+
+        for _ in range(GH_CONFLICT_RETRIES):
+            r = _request_with_backoff("GET", f"{api}/ref/{ref}", headers=headers, timeout=20)
+            if r.status_code != 200:
+                return False, "error", _gh_error_message(r)
+            head = r.json()["object"]["sha"]
+            r = _request_with_backoff("GET", f"{api}/commits/{head}", headers=headers, timeout=20)
+            if r.status_code != 200:
+                return False, "error", _gh_error_message(r)
+            base_tree = r.json()["tree"]["sha"]
+            if bases:
+                # 先頭の tree から各ファイルの現在の sha を取り、他から更新されたものはマージし直す
+                r = _request_with_backoff(
+                    "GET", f"{api}/trees/{base_tree}", headers=headers, params={"recursive": "1"}, timeout=20,
+                )
+                if r.status_code != 200:
+                    return False, "error", _gh_error_message(r)
+                remote_shas = {e["path"]: e["sha"] for e in r.json().get("tree", [])}
+                for remote in bases:
+                    remote_sha = remote_shas.get(remote)
+                    if known_shas[remote] and remote_sha and remote_sha not in (known_shas[remote], blob_shas[remote]):
+                        files[remote] = merges[remote](_fetch_blob(conf, headers, remote_sha), files[remote], bases[remote])
+                        blob_shas[remote] = _git_blob_sha(files[remote])
+                        known_shas[remote] = remote_sha
+                        r = _request_with_backoff(
+                            "POST", f"{api}/blobs", headers=headers,
+                            data=_PutBody({"encoding": "base64"}, _b64_for(files[remote], blob_shas[remote])), timeout=20,
+                        )
+                        if r.status_code != 201:
+                            return False, "error", _gh_error_message(r)
+            tree = [{"path": remote, "mode": "100644", "type": "blob", "sha": blob_shas[remote]} for remote in changed]
+            r = _request_with_backoff(
+                "POST", f"{api}/trees", headers=headers, timeout=20,
+                json={"base_tree": base_tree, "tree": tree},
+            )
+            if r.status_code != 201:
+                return False, "error", _gh_error_message(r)
+            r = _request_with_backoff(
+                "POST", f"{api}/commits", headers=headers, timeout=20,
+                json={
+                    "message": f"{commit_message} ({ts})",
+                    "tree": r.json()["sha"],
+                    "parents": [head],
+                    "committer": {"name": "Streamlit App", "email": "noreply@example.com"},
+                },
+            )
+            if r.status_code != 201:
+                return False, "error", _gh_error_message(r)
+            r = _request_with_backoff(
+                "PATCH", f"{api}/refs/{ref}", headers=headers, timeout=20,
+                json={"sha": r.json()["sha"], "force": False},
+            )
+            if r.status_code == 200:
+                for remote in changed:
+                    GH_STATE["sha"][remote] = blob_shas[remote]
+                return True, "success", "GitHubへ保存完了"
+            if r.status_code != 422:
+                return False, "error", _gh_error_message(r)
+        return False, "warning", "他の更新と競合しました。最新を読み直してから再保存してください。"
     except Exception as e:
-        st.error(f"GitHub保存中に例外: {e}")
+        return False, "error", f"GitHub保存中に例外: {e}"
+
+def _gh_error_message(resp: requests.Response) -> str:
+    messages = {
+        401: "401 Unauthorized: トークン無効。新しいPATをSecretsへ。",
+        403: "403 Forbidden: 権限不足/保護ルール。PAT権限『Contents: Read and write』やブランチ保護を確認。",
+        404: "404 Not Found: OWNER/REPO/PATH/BRANCH を再確認。",
+        429: "429 Too Many Requests: レート制限。しばらく待って再試行してください。",
+    }
+    return messages.get(resp.status_code, f"GitHub保存失敗: {resp.status_code} {resp.text[:300]}")
+
+def _show_gh_result(ok: bool, level: str, msg: str):
+    if ok:
+        st.toast(msg, icon="✅")
+    elif level == "warning":
+        st.warning(msg)
+    else:
+        st.error(msg)
+
+def save_to_github_file(content: bytes, remote_path: str, commit_message: str, debug: bool = False,
+                        merge=None) -> bool:
+    """GitHub へ同期保存（手動保存・診断用）。結果はその場で表示する。"""
+    conf, missing = _gh_conf()
+    if missing:
+        st.error(f"Secrets が不足しています: {missing}（Manage app → Settings → Secrets を確認）")
         return False
+    log = [] if debug else None
+    ok, level, msg = _push_to_github(content, remote_path, commit_message, conf, use_cache=not debug, log=log, merge=merge)
+    for entry in log or []:
+        st.write(entry)
+    _show_gh_result(ok, level, msg)
+    return ok
 
-def save_to_github_csv(local_path: str = CSV_PATH, debug: bool = False) -> bool:
+# ------------------------------
+# バックグラウンド保存（編集操作は GitHub の往復を待たない）
+# ------------------------------
+@st.cache_resource
+def _gh_sync_worker() -> dict:
+    """
+    GitHub 保存のワーカースレッド（プロセスで 1 つ）。
+    最初の依頼から GH_SYNC_DEBOUNCE_SEC だけ待ってキューをまとめて取り出し、セッションごとに束ねる。
+    同じ remote_path は最新の内容だけ送り、1 セッションで複数ファイル（タスク + 監査ログ）あれば 1 コミットにまとめる。
+    結果と未処理件数はセッションごとに保持し、report_github_sync() で表示する。
+    """
+    q = queue.Queue()
+    results = {}
+    pending = {}
+    lock = threading.Lock()
+
+    def _run():
+        while True:
+            jobs = [q.get()]
+            deadline = time.monotonic() + GH_SYNC_DEBOUNCE_SEC
+            while True:
+                try:
+                    jobs.append(q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            batches = {}
+            for job in jobs:
+                batch = batches.setdefault(job["sid"], {"conf": job["conf"], "files": {}, "jobs": 0})
+                batch["files"][job["remote"]] = (job["content"], job["message"], job["merge"])
+                batch["jobs"] += 1
+            for sid, batch in batches.items():
+                files = batch["files"]
+                try:
+                    if len(files) == 1:
+                        (remote, (content, message, merge)), = files.items()
+                        result = _push_to_github(content, remote, message, batch["conf"], merge=merge)
+                    else:
+                        result = _push_many_to_github(
+                            {remote: content for remote, (content, _, _) in files.items()},
+                            f"Update {', '.join(files)} from Streamlit app", batch["conf"],
+                            merges={remote: merge for remote, (_, _, merge) in files.items() if merge is not None},
+                        )
+                except Exception as e:
+                    result = (False, "error", f"GitHub保存中に例外: {e}")
+                with lock:
+                    results.setdefault(sid, []).append(result)
+                    pending[sid] -= batch["jobs"]
+                    if not pending[sid]:
+                        del pending[sid]
+            for _ in jobs:
+                q.task_done()
+
+    threading.Thread(target=_run, name="github-sync", daemon=True).start()
+    return {"queue": q, "results": results, "pending": pending, "lock": lock}
+
+def enqueue_github_save(content: bytes, remote_path: str, commit_message: str, merge=None) -> bool:
+    """GitHub 保存をバックグラウンドへ依頼（設定不足のときだけ即座に False）"""
+    conf, missing = _gh_conf()
+    if missing:
+        st.error(f"Secrets が不足しています: {missing}（Manage app → Settings → Secrets を確認）")
+        return False
+    sid = st.session_state.setdefault("gh_sync_id", str(uuid.uuid4()))
+    worker = _gh_sync_worker()
+    with worker["lock"]:
+        worker["pending"][sid] = worker["pending"].get(sid, 0) + 1
+    worker["queue"].put({
+        "sid": sid, "content": content, "remote": remote_path, "message": commit_message, "conf": conf,
+        "merge": merge,
+    })
+    return True
+
+def _github_sync_pending() -> int:
+    """このセッションが依頼して、まだ終わっていないバックグラウンド保存の件数"""
+    worker = _gh_sync_worker()
+    with worker["lock"]:
+        return worker["pending"].get(st.session_state["gh_sync_id"], 0)
+
+def _github_sync_status():
+    """このセッションが依頼したバックグラウンド保存の結果と、残りの件数を表示"""
+    pending = _github_sync_pending()
+    if not pending and st.session_state.get("gh_sync_polling"):
+        # 保存待ちが無くなったらページ全体を再実行し、ポーリングを止める（結果はその再実行で表示）
+        st.rerun(scope="app")
+    worker = _gh_sync_worker()
+    with worker["lock"]:
+        results = worker["results"].pop(st.session_state["gh_sync_id"], [])
+    for ok, level, msg in results:
+        _show_gh_result(ok, level, msg)
+    if pending:
+        st.caption(f"GitHub 同期中…（{pending} 件）")
+
+def report_github_sync():
+    """
+    バックグラウンド保存の結果を表示。このセッションの保存待ちがある間は結果欄だけを fragment として
+    GH_SYNC_POLL_SEC ごとに再実行し、終わったらページ全体を 1 回だけ再実行してポーリングを止める。
+    """
+    if not st.session_state.get("gh_sync_id"):
+        return
+    polling = bool(_github_sync_pending())
+    st.session_state["gh_sync_polling"] = polling
+    st.fragment(_github_sync_status, run_every=GH_SYNC_POLL_SEC if polling else None)()
+
+def save_to_github_csv(df: pd.DataFrame, debug: bool = False, background: bool = False) -> bool:
+    """タスクを CSV にエクスポートして GitHub へ保存（リポジトリ側は人が読める CSV のまま）"""
     remote = st.secrets.get("GITHUB_PATH")
     if not remote:
         st.error("Secrets に GITHUB_PATH がありません。")
         return False
-    return save_to_github_file(local_path, remote, "Update tasks.csv from Streamlit app", debug=debug)
+    content = tasks_to_csv_bytes(df)
+    if background:
+        return enqueue_github_save(content, remote, "Update tasks.csv from Streamlit app", merge=merge_tasks_csv)
+    return save_to_github_file(content, remote, "Update tasks.csv from Streamlit app", debug=debug, merge=merge_tasks_csv)
 
-def save_audit_to_github(debug: bool = False) -> bool:
+def save_audit_to_github(debug: bool = False, background: bool = False) -> bool:
     remote_audit = st.secrets.get("GITHUB_PATH_AUDIT")
     if not remote_audit:
         return True
-    return save_to_github_file(AUDIT_PATH, remote_audit, "Update audit.csv from Streamlit app", debug=debug)
+    try:
+        with open(AUDIT_PATH, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return True
+    if background:
+        return enqueue_github_save(content, remote_audit, "Update audit.jsonl from Streamlit app")
+    return save_to_github_file(content, remote_audit, "Update audit.jsonl from Streamlit app", debug=debug)
 
 # ==============================
 #       監査ログ
 # ==============================
+def flush_audit(debug: bool = False, background: bool = False) -> bool:
+    """未反映の監査ログを GitHub へまとめて保存（成功/依頼時にカウンタをリセット）"""
+    ok = save_audit_to_github(debug=debug, background=background)
+    if ok:
+        st.session_state["audit_unflushed"] = 0
+    return ok
+
+AUDIT_CTRL_RE = re.compile(r"[\x00-\x1f\x7f]")
+AUDIT_GENESIS_HASH = "0" * 64
+
+def _audit_hash(prev_hash: str, rec: dict) -> str:
+    """直前行のハッシュ + 正規化 JSON（キー順固定・空白なし）の SHA-256"""
+    canonical = json.dumps(rec, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256((prev_hash + canonical).encode("utf-8")).hexdigest()
+
+def _audit_tail_hash() -> str:
+    """監査ログ末尾行の hash（ファイル末尾から逆向きに読むので件数に依存しない）"""
+    try:
+        with open(AUDIT_PATH, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            tail = b""
+            while pos > 0 and tail.count(b"\n") < 2:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+    except FileNotFoundError:
+        return AUDIT_GENESIS_HASH
+    lines = tail.strip().splitlines()
+    if not lines:
+        return AUDIT_GENESIS_HASH
+    try:
+        return json.loads(lines[-1]).get("hash") or AUDIT_GENESIS_HASH
+    except ValueError:
+        return AUDIT_GENESIS_HASH
+
+@st.cache_resource
+def _audit_lock() -> threading.Lock:
+    """監査ログの追記ロック（プロセスで 1 つ）。セッションは別スレッドで動くので、末尾 hash の読み取りと追記を不可分にする"""
+    return threading.Lock()
+
+def write_audits(action: str, entries: list):
+    """
+    監査ログを JSONL へまとめて追記（entries: (task_id, before, after) のリスト。既存ファイルは読み直さない）。
+    各行は直前行の hash を prevHash に持つハッシュチェーン（改ざんは verify_audit_chain で検出）。
+    末尾 hash の読み取りとファイルのオープンは何件でも 1 回だけ。
+    GitHub への反映は操作の終わりに maybe_flush_audit()（AUDIT_FLUSH_EVERY 件ごと）、またはサイドバーの手動保存でまとめて行う。
+    """
+    ts = now_jst().strftime("%Y-%m-%d %H:%M:%S")
+    user = st.session_state.get("current_user", "unknown")
+    recs = []
+    for task_id, before, after in entries:
+        rec = {
+            "ts": ts,
+            "user": user,
+            "action": action,              # "create" | "update" | "delete" | "delete_bulk" | "close"
+            "task_id": task_id,
+            "before": str(before) if before else "",
+            "after": str(after) if after else "",
+        }
+        # 制御文字は置換（ログインジェクション対策）
+        recs.append({k: AUDIT_CTRL_RE.sub("\ufffd", v) for k, v in rec.items()})
+    # 別セッションの追記と同じ prevHash から分岐しないよう、末尾の読み取りから追記までをロックする
+    with _audit_lock():
+        prev_hash = _audit_tail_hash()
+        lines = []
+        for rec in recs:
+            rec_out = {**rec, "prevHash": prev_hash, "hash": _audit_hash(prev_hash, rec)}
+            prev_hash = rec_out["hash"]
+            lines.append(json.dumps(rec_out, ensure_ascii=False) + "\n")
+        with open(AUDIT_PATH, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+    st.session_state["audit_unflushed"] = st.session_state.get("audit_unflushed", 0) + len(lines)
+
 def write_audit(action: str, task_id: str, before: dict, after: dict):
-    rec = {
-        "ts": now_jst().strftime("%Y-%m-%d %H:%M:%S"),
-        "user": st.session_state.get("current_user", "unknown"),
-        "action": action,              # "create" | "update" | "delete" | "delete_bulk" | "close"
-        "task_id": task_id,
-        "before": str(before) if before else "",
-        "after": str(after) if after else "",
-    }
+    """監査ログを 1 件追記（write_audits の 1 件版）"""
+    write_audits(action, [(task_id, before, after)])
+
+def maybe_flush_audit():
+    """操作 1 回分の監査ログを書き終えたら呼ぶ。未反映が AUDIT_FLUSH_EVERY 件以上なら GitHub 保存を 1 回だけ依頼"""
+    if st.session_state.get("audit_unflushed", 0) >= AUDIT_FLUSH_EVERY:
+        flush_audit(background=True)
+
+def verify_audit_chain() -> tuple:
+    """
+    監査ログのハッシュチェーンを先頭から検証（1 回の順次読み込み）。
+    戻り値: (問題なしか, 最初に不整合となった行番号 or None)。チェーン導入前の行（hash 無し）は読み飛ばす。
+    """
+    prev_hash = None
     try:
-        df_a = pd.read_csv(AUDIT_PATH, encoding="utf-8-sig")
+        with open(AUDIT_PATH, encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    return False, lineno
+                h = rec.pop("hash", None)
+                prev = rec.pop("prevHash", None)
+                if h is None:
+                    continue
+                if prev_hash is not None and prev != prev_hash:
+                    return False, lineno
+                if _audit_hash(prev, rec) != h:
+                    return False, lineno
+                prev_hash = h
     except FileNotFoundError:
-        df_a = pd.DataFrame(columns=rec.keys())
-    df_a = pd.concat([df_a, pd.DataFrame([rec])], ignore_index=True)
-    df_a.to_csv(AUDIT_PATH, index=False, encoding="utf-8-sig")
-    save_audit_to_github(debug=False)
+        pass
+    return True, None
+
+def load_audit() -> pd.DataFrame:
+    """
+    監査ログの閲覧用ローダー（表示時のみ読み込む）。
+    JSONL 化以前の audit.csv（LEGACY_AUDIT_PATH）が残っていれば、その行を先頭に連結して履歴を途切れさせない。
+    """
+    frames = []
+    if LEGACY_AUDIT_PATH != AUDIT_PATH and os.path.exists(LEGACY_AUDIT_PATH):
+        try:
+            frames.append(pd.read_csv(LEGACY_AUDIT_PATH, encoding="utf-8-sig", dtype=str, keep_default_na=False))
+        except ValueError:
+            pass
+    try:
+        frames.append(pd.read_json(AUDIT_PATH, lines=True, dtype=False))
+    except (FileNotFoundError, ValueError):
+        pass
+    if not frames:
+        return pd.DataFrame(columns=["ts", "user", "action", "task_id", "before", "after"])
+    return pd.concat(frames, ignore_index=True)
 
 # ==============================
 #       表示ユーティリティ
 # ==============================
-def status_badge(s: str) -> str:
-    mapping = {"未対応": "⏳ 未対応", "対応中": "🚧 対応中", "クローズ": "✅ クローズ"}
-    return mapping.get(str(s).strip(), str(s))
+STATUS_BADGE = {"未対応": "⏳ 未対応", "対応中": "🚧 対応中", "クローズ": "✅ クローズ"}
+# 一覧の列順
+DISPLAY_ORDER = ["対応状況", "タスク", "更新者", "次アクション", "備考", "起票日", "更新日", "ソース", "ID"]
+# 行ハイライトの色（淡色）
+C_CLOSE = "background-color: #ECF8EC"
+C_PROG = "background-color: #EDF5FF"
+C_OPEN = "background-color: #FFF1F1"
+C_REPLY = "background-color: #FFF7DB"
+C_KEYWORD = "background-color: #FFF0B3;"
 
 def make_display_df(df: pd.DataFrame) -> pd.DataFrame:
     """一覧表示用（列順・ステータス表記・URL整形・更新日降順）"""
-    d = df.copy()
-    d["対応状況"] = d["対応状況"].apply(status_badge)
-
-    def to_link(x: str) -> str:
-        s = str(x).strip()
-        return s if s.startswith("http://") or s.startswith("https://") else s
-    d["ソース"] = d["ソース"].apply(to_link)
-
-    order = ["対応状況", "タスク", "更新者", "次アクション", "備考", "起票日", "更新日", "ソース", "ID"]
-    for c in order:
-        if c not in d.columns: d[c] = ""
-    d = d[order].sort_values("更新日", ascending=False)
-    return d
+    # 元の DataFrame はコピーせず、表示列だけで新しい DataFrame を組み立てる
+    # ステータス絵文字は辞書の map、URL 整形は前後空白の除去のみ（どちらも列単位で処理）
+    status = df["対応状況"].astype(str)
+    cols = {c: (df[c] if c in df.columns else "") for c in DISPLAY_ORDER}
+    cols["対応状況"] = status.str.strip().map(STATUS_BADGE).fillna(status)
+    cols["ソース"] = df["ソース"].astype(str).str.strip()
+    return pd.DataFrame(cols, index=df.index).sort_values("更新日", ascending=False)
 
 def style_rows(df_disp_like: pd.DataFrame, reply_mask: pd.Series):
     """
     状態（未対応/対応中/クローズ）＋返信待ちを淡色で行ハイライト。
     df_disp_like: make_display_df() 後の列構成を想定（先頭列が対応状況）
     """
-    import numpy as np
-    base = df_disp_like.copy()
+    base = df_disp_like  # Styler は元の DataFrame を変更しないのでコピー不要
     raw_status = base["対応状況"].astype(str)
-    colors = np.full((len(base), len(base.columns)), "", dtype=object)
-
-    def paint_row(i, color): colors[i, :] = f"background-color: {color}"
-
-    for i, s in enumerate(raw_status):
-        if "クローズ" in s: paint_row(i, "#ECF8EC")
-        elif "対応中" in s: paint_row(i, "#EDF5FF")
-        elif "未対応" in s: paint_row(i, "#FFF1F1")
-
-    for i, wait in enumerate(reply_mask):
-        if bool(wait): colors[i, :] = "background-color: #FFF7DB"  # 返信待ち優先
+    # 行ごとの CSS を 1 本だけ作り、列単位（axis=0）で同じベクトルを返す（R×C の行列は作らない）
+    row_css = np.select(
+        [
+            np.asarray(reply_mask, dtype=bool),  # 返信待ち優先
+            raw_status.str.contains("クローズ", regex=False).to_numpy(),
+            raw_status.str.contains("対応中", regex=False).to_numpy(),
+            raw_status.str.contains("未対応", regex=False).to_numpy(),
+        ],
+        [C_REPLY, C_CLOSE, C_PROG, C_OPEN],
+        default="",
+    ).astype(object)
 
     return (
         base.style
         .set_properties(**{"font-size": "0.95rem"})
         .set_table_styles([{"selector": "th", "props": [("font-size", "0.9rem")]}])
-        .apply(lambda _: colors, axis=None)
+        .apply(lambda _col: row_css, axis=0)
         .hide(axis="index")
     )
 
@@ -384,25 +1248,23 @@ def style_cells_keyword(df_disp_like: pd.DataFrame, kw: str, target_cols=("タ
     """
     target_cols に含まれるセルで kw を含む部分を強調（背景淡黄）。
     """
-    base = df_disp_like.copy()
-    # マスク作成
-    mask = pd.DataFrame(False, index=base.index, columns=base.columns)
-    if kw:
-        pattern = re.escape(str(kw))
-        for c in target_cols:
-            if c in base.columns:
-                mask[c] = base[c].astype(str).str.contains(pattern, na=False)
-
-    styles = pd.DataFrame("", index=base.index, columns=base.columns)
-    styles[mask] = "background-color: #FFF0B3;"
-
-    return (
+    base = df_disp_like  # Styler は元の DataFrame を変更しないのでコピー不要
+    styler = (
         base.style
         .set_properties(**{"font-size": "0.95rem"})
         .set_table_styles([{"selector": "th", "props": [("font-size", "0.9rem")]}])
-        .apply(lambda _: styles, axis=None)
         .hide(axis="index")
     )
+    cols = [c for c in target_cols if c in base.columns]
+    if not kw or not cols:
+        return styler
+    # パターンは 1 回だけコンパイルし、対象列だけを列単位で塗る（全セル分のマスク/スタイル表は作らない）
+    # サイドバーのキーワード絞り込みと同じく大文字小文字は区別しない
+    pattern = re.compile(re.escape(str(kw)), re.IGNORECASE)
+    return styler.apply(
+        lambda col: np.where(col.astype(str).str.contains(pattern, na=False), C_KEYWORD, ""),
+        axis=0, subset=cols,
+    )
 
 def _fmt_display(dt: pd.Timestamp) -> str:
     if pd.isna(dt): return "-"
@@ -411,19 +1273,78 @@ def _fmt_display(dt: pd.Timestamp) -> str:
         if getattr(ts, "tzinfo", None) is not None: ts = ts.tz_localize(None)
         dt = ts
     except Exception: pass
-    return dt.strftime("%Y-%m-%d %H:%M:%S" if SAVE_WITH_TIME else "%Y-%m-%d")
+    return dt.strftime(DATE_FMT)
+
+def fmt_col(s: pd.Series) -> pd.Series:
+    """_fmt_display の列版（1 回のベクトル演算で文字列化、欠損は "-"）"""
+    return pd.to_datetime(s, errors="coerce").dt.strftime(DATE_FMT).fillna("-")
 
 def compute_reply_mask(df_in: pd.DataFrame) -> pd.Series:
-    rm = pd.Series(False, index=df_in.index)
-    for k in ["返信待ち", "返信無し", "返信なし", "返信ない", "催促"]:
-        rm = rm | df_in["次アクション"].str.contains(k, na=False) | df_in["備考"].str.contains(k, na=False)
-    return rm
+    return (
+        df_in["次アクション"].astype(str).str.contains(REPLY_RE, na=False)
+        | df_in["備考"].astype(str).str.contains(REPLY_RE, na=False)
+    )
+
+@st.cache_data(show_spinner=False)
+def reply_mask_for(version: tuple, _df: pd.DataFrame) -> pd.Series:
+    """load_tasks() の結果に対する返信待ちマスク（データの版ごとに 1 回だけ計算）"""
+    return compute_reply_mask(_df)
+
+@st.cache_data(show_spinner=False)
+def display_df_for(version: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """load_tasks() 全件の表示用 DataFrame（データの版ごとに 1 回だけ整形・並べ替え）"""
+    return make_display_df(_df)
+
+@st.cache_data(show_spinner=False)
+def lookups_for(version: tuple, _df: pd.DataFrame) -> tuple:
+    """ID → 行 / 更新日の表示文字列 / 行位置 の辞書と担当者の選択肢（データの版ごとに 1 回だけ作る）"""
+    rows_by_id = _df.set_index("ID").to_dict("index")
+    fmt_by_id = dict(zip(_df["ID"], fmt_col(_df["更新日"])))
+    pos_by_id = dict(zip(_df["ID"], range(len(_df))))
+    owners = _df["更新者"].astype(str)
+    assignee_choices = sorted(set(owners[owners.str.strip() != ""]) | set(FIXED_OWNERS))
+    return rows_by_id, fmt_by_id, pos_by_id, assignee_choices
+
+@st.cache_data(show_spinner=False)
+def filter_choices_for(version: tuple, _df: pd.DataFrame) -> tuple:
+    """サイドバーの選択肢（対応状況 / 担当者）。データの版ごとに 1 回だけ作る"""
+    status_options = ["すべて"] + sorted(_df["対応状況"].dropna().unique().tolist())
+    assignees = sorted([a for a in _df["更新者"].dropna().unique().tolist() if str(a).strip() != ""])
+    return status_options, assignees
+
+@st.cache_data(show_spinner=False)
+def status_counts_for(version: tuple, _df: pd.DataFrame) -> pd.Series:
+    """対応状況ごとの件数（サマリー / グラフ用）。カテゴリ型は未使用の状態も 0 件で数えるので、出てくる状態だけに絞る"""
+    counts = _df["対応状況"].value_counts()
+    return counts[counts > 0]
+
+@st.cache_data(show_spinner=False)
+def search_text_for(version: tuple, _df: pd.DataFrame) -> pd.Series:
+    """
+    キーワード検索用の連結列（タスク/備考/次アクションを区切り文字 \x1f で連結し小文字化）。
+    区切りをまたいだ一致は起きない。データの版ごとに 1 回だけ作り、入力のたびに作り直さない。
+    """
+    return _df["タスク"].astype(str).str.cat(
+        [_df["備考"].astype(str), _df["次アクション"].astype(str)], sep="\x1f"
+    ).str.lower()
+
+def display_rows(disp_all: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """表示用 DataFrame から rows（df の部分集合）の行だけを並び順を保って取り出す"""
+    return disp_all[disp_all.index.isin(rows.index)]
 
 # ==============================
 #       データ読み込み
 # ==============================
-df = load_tasks()
-df_by_id = df.set_index("ID")
+data_version = tasks_version()
+df = load_tasks(data_version)
+# 表示用の“いま”は再実行ごとに 1 回だけ取る（保存時の時刻は now_ts_jst() でその都度取得）
+NOW = now_jst()
+NOW_TS = pd.Timestamp(NOW).tz_localize(None)
+NOW_STR = NOW.strftime(DATE_FMT)
+# ID → 行 の辞書（format_func 等は .loc ではなく辞書引き）と担当者の選択肢。データの版ごとにキャッシュ
+rows_by_id, fmt_by_id, pos_by_id, assignee_choices = lookups_for(data_version, df)
+# 前回までに依頼したバックグラウンド保存の結果を表示
+report_github_sync()
 
 # ==============================
 #       簡易ログイン
@@ -447,6 +1368,7 @@ else:
 # ==============================
 def _do_refresh():
     st.cache_data.clear()
+    forget_tasks()
     st.rerun()
 st.sidebar.button("最新を読み込む", on_click=_do_refresh)
 
@@ -454,31 +1376,29 @@ st.sidebar.button("最新を読み込む", on_click=_do_refresh)
 #       サイドバー・フィルター
 # ==============================
 st.sidebar.header("フィルター")
-status_options = ["すべて"] + sorted(df["対応状況"].dropna().unique().tolist())
+status_options, assignees = filter_choices_for(data_version, df)
 status_sel = st.sidebar.selectbox("対応状況", status_options)
-assignees = sorted([a for a in df["更新者"].dropna().unique().tolist() if str(a).strip() != ""])
 assignee_sel = st.sidebar.multiselect("担当者", assignees)
 kw = st.sidebar.text_input("キーワード（タスク/備考/次アクション）")
 
-filtered_df = df.copy()
+# 条件ごとに DataFrame を作らず、真偽マスクを合成して最後に 1 回だけ抽出する
+mask = np.ones(len(df), dtype=bool)
 if status_sel != "すべて":
-    filtered_df = filtered_df[filtered_df["対応状況"] == status_sel]
+    mask &= (df["対応状況"] == status_sel).to_numpy()
 if assignee_sel:
-    filtered_df = filtered_df[filtered_df["更新者"].isin(assignee_sel)]
+    mask &= df["更新者"].isin(assignee_sel).to_numpy()
 if kw:
-    mask_kw = (
-        filtered_df["タスク"].str.contains(kw, na=False, regex=False)
-        | filtered_df["備考"].str.contains(kw, na=False, regex=False)
-        | filtered_df["次アクション"].str.contains(kw, na=False, regex=False)
-    )
-    filtered_df = filtered_df[mask_kw]
+    # 連結済みの検索列を 1 回だけ走査（大文字小文字は区別しない）
+    mask &= search_text_for(data_version, df).str.contains(kw.lower(), na=False, regex=False).to_numpy()
+filtered_df = df[mask]
 
 # ==============================
 #       サマリー + グラフ
 # ==============================
 total = len(df)
-status_counts = df["対応状況"].value_counts()
-reply_mask_all = compute_reply_mask(df)
+status_counts = status_counts_for(data_version, df)
+reply_mask_all = reply_mask_for(data_version, df)
+disp_all = display_df_for(data_version, df)
 reply_count = int(df[reply_mask_all].shape[0])
 
 c1, c2, c3, c4 = st.columns(4)
@@ -510,16 +1430,13 @@ with tab_list:
 
     left, right = st.columns([2, 1])
     with left:
-        quick = st.radio("クイックフィルタ", ["すべて", "未対応", "対応中", "クローズ"], horizontal=True)
+        quick = st.radio("クイックフィルタ", ["すべて"] + STATUS_OPTIONS, horizontal=True)
     with right:
         show_sticky = st.toggle("左2列（状態/タスク）を固定", value=True)
 
-    base = filtered_df.copy()
-    if quick != "すべて":
-        base = base[base["対応状況"] == quick]
+    base = filtered_df if quick == "すべて" else filtered_df[filtered_df["対応状況"] == quick]
 
-    disp_raw = base.copy()  # 生
-    disp = make_display_df(base)  # 表示用
+    disp = display_rows(disp_all, base)  # 表示用（全件の整形結果から抽出）
 
     # 固定列CSS（環境により効かない場合あり）
     if show_sticky:
@@ -533,6 +1450,9 @@ with tab_list:
         horizontal=True,
         help="件数が多い場合は『高速』を推奨。Stylerを使うモードは重くなることがあります。",
     )
+    if mode != "高速（推奨）" and len(disp) > STYLER_MAX_ROWS:
+        st.info(f"表示件数が {STYLER_MAX_ROWS} 件を超えるため、高速モードで表示しています。")
+        mode = "高速（推奨）"
 
     # 列幅/書式（ColumnConfig）
     df_kwargs = dict(use_container_width=True, hide_index=True, height=min(700, 100 + max(320, len(disp) * 34)))
@@ -561,13 +1481,13 @@ with tab_list:
         st.dataframe(disp, **df_kwargs)
 
     elif mode == "高可読：行ハイライト":
-        # 返信待ち判定は disp_raw の行順に合わせる
-        rm = compute_reply_mask(disp_raw).reindex(disp.index)
+        # 返信待ち判定は全体で計算済みのマスクを disp の行順に合わせて再利用
+        rm = reply_mask_all.reindex(disp.index)
         sty = style_rows(disp, rm)
         st.dataframe(sty, use_container_width=True, height=df_kwargs["height"])
 
     else:  # 行ハイライト + キーワード強調
-        rm = compute_reply_mask(disp_raw).reindex(disp.index)
+        rm = reply_mask_all.reindex(disp.index)
         # まず行色
         sty = style_rows(disp, rm)
         # さらにキーワード強調を上書き（対象セルのみ淡黄）
@@ -579,34 +1499,29 @@ with tab_list:
         else:
             st.dataframe(sty, use_container_width=True, height=df_kwargs["height"])
 
+    st.download_button(
+        "表示中の一覧をCSVでダウンロード",
+        data=sanitize_df_text_columns(disp).to_csv(index=False).encode("utf-8-sig"),
+        file_name="tasks_export.csv",
+        mime="text/csv",
+    )
+
 # ------------------------------
 # ✅ クローズ候補
 # ------------------------------
 with tab_close:
     st.subheader("クローズ候補（対応中かつ返信待ち系、更新が7日以上前）")
 
-    now_ts = pd.Timestamp(now_jst()).tz_localize(None)
-    threshold_dt = now_ts - pd.Timedelta(days=7)
-
-    in_progress = df[df["対応状況"].eq("対応中")]
-    reply_df = df[reply_mask_all]
-    closing_candidates = in_progress[in_progress.index.isin(reply_df.index)].copy()
-
-    closing_candidates["更新日"] = pd.to_datetime(closing_candidates["更新日"], errors="coerce")
-    try:
-        if getattr(closing_candidates["更新日"].dt, "tz", None) is not None:
-            closing_candidates["更新日"] = closing_candidates["更新日"].dt.tz_localize(None)
-    except Exception:
-        pass
+    threshold_dt = NOW_TS - pd.Timedelta(days=7)
 
-    closing_candidates = closing_candidates[
-        closing_candidates["更新日"].notna() & (closing_candidates["更新日"] < threshold_dt)
-    ]
+    # 候補は 1 本のマスクで抽出（更新日は読み込み時点で tz-naive の JST。再解釈は不要）
+    upd = df["更新日"]
+    closing_candidates = df[df["対応状況"].eq("対応中") & reply_mask_all & upd.notna() & (upd < threshold_dt)]
 
     if closing_candidates.empty:
         st.info("該当なし")
     else:
-        show = make_display_df(closing_candidates)
+        show = display_rows(disp_all, closing_candidates)
         df_kwargs2 = dict(use_container_width=True, hide_index=True, height=360)
         if cc is not None:
             df_kwargs2["column_config"] = {
@@ -619,23 +1534,28 @@ with tab_close:
         to_close_ids = st.multiselect(
             "クローズするタスク（複数選択可）",
             closing_candidates["ID"].tolist(),
-            format_func=lambda _id: f'{df_by_id.loc[_id,"タスク"]} / {df_by_id.loc[_id,"更新者"]} / {_fmt_display(df_by_id.loc[_id,"更新日"])}'
+            format_func=lambda _id: f'{rows_by_id[_id]["タスク"]} / {rows_by_id[_id]["更新者"]} / {fmt_by_id[_id]}'
         )
         if st.button("選択したタスクをクローズに更新", type="primary", disabled=(len(to_close_ids) == 0)):
-            befores = {tid: df_by_id.loc[tid, ["対応状況", "更新日"]].to_dict() for tid in to_close_ids}
-            df.loc[df["ID"].isin(to_close_ids), "対応状況"] = "クローズ"
-            df.loc[df["ID"].isin(to_close_ids), "更新日"] = pd.Timestamp(now_jst())
-            save_tasks(df)
-            ok = save_to_github_csv(debug=False)
+            befores = {tid: {c: rows_by_id[tid][c] for c in ["対応状況", "更新日"]} for tid in to_close_ids}
+            closed_at = now_ts_jst()
+            # ID 列を走査せず、キャッシュ済みの行位置へ直接書き込む（ページ全体で使う df ではなくコピーへ）
+            pos = [pos_by_id[tid] for tid in to_close_ids]
+            df2 = df.copy()
+            df2.iloc[pos, df2.columns.get_indexer(["対応状況", "更新日"])] = ["クローズ", closed_at]
+            journal_state = append_journal("upsert", journal_rows(df2, pos))
+            maybe_compact_journal()
+            remember_tasks(df2, data_version, journal_state)
+            after = {"対応状況": "クローズ", "更新日": _fmt_display(closed_at)}
+            write_audits("close", [(tid, befores.get(tid), after) for tid in to_close_ids])
+            st.cache_data.clear()
+            ok = save_to_github_csv(df2, background=True)
             if ok:
-                for tid in to_close_ids:
-                    after = {"対応状況": "クローズ", "更新日": _fmt_display(pd.Timestamp(now_jst()))}
-                    write_audit("close", tid, befores.get(tid), after)
+                maybe_flush_audit()
                 st.success(f"{len(to_close_ids)}件をクローズに更新しました。")
-                st.cache_data.clear()
                 st.rerun()
             else:
-                st.error("GitHub保存に失敗しました。最新を読み直して再試行してください。")
+                st.error("ローカルには保存しましたが、GitHub保存に失敗しました。最新を読み直して再試行してください。")
 
 # ------------------------------
 # ➕ 新規追加
@@ -644,14 +1564,12 @@ with tab_add:
     st.subheader("新規タスク追加（起票日/更新日は自動でJSTの“いま”）")
     with st.form("add"):
         c1, c2, c3 = st.columns(3)
-        c1.markdown(f"起票日: **{now_jst_str()}**")
-        c2.markdown(f"更新日: **{now_jst_str()}**")
-        status = c3.selectbox("対応状況", ["未対応", "対応中", "クローズ"], index=1)
+        c1.markdown(f"起票日: **{NOW_STR}**")
+        c2.markdown(f"更新日: **{NOW_STR}**")
+        status = c3.selectbox("対応状況", STATUS_OPTIONS, index=1)
 
         task = st.text_input("タスク（件名）")
-        fixed_assignees = st.secrets.get("FIXED_OWNERS", ["都筑", "二上", "三平", "成瀬", "柿野", "花田", "武藤", "島浦"])
-        ass_choices = sorted(set([a for a in df["更新者"].tolist() if str(a).strip() != ""] + list(fixed_assignees)))
-        assignee = st.selectbox("更新者（担当）", options=ass_choices)
+        assignee = st.selectbox("更新者（担当）", options=assignee_choices)
 
         next_action = st.text_area("次アクション")
         notes = st.text_area("備考")
@@ -659,7 +1577,7 @@ with tab_add:
 
         submitted = st.form_submit_button("追加", type="primary")
         if submitted:
-            now_ts2 = pd.Timestamp(now_jst())
+            now_ts2 = now_ts_jst()
             new_row = {
                 "ID": str(uuid.uuid4()),
                 "起票日": now_ts2,
@@ -671,19 +1589,26 @@ with tab_add:
                 "備考": notes,
                 "ソース": source,
             }
-            df2 = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            save_tasks(df2)
-            ok = save_to_github_csv(debug=False)
+            # 1 行だけ末尾に追加（全列を作り直す concat は行数に比例して重い）。
+            # ページ全体で使う df は書き換えない（版ごとのキャッシュ済みルックアップとずれるため）
+            df2 = df.copy()
+            df2.loc[len(df2)] = new_row
+            journal_state = append_journal("upsert", [new_row])
+            maybe_compact_journal()
+            remember_tasks(df2, data_version, journal_state)
+            # ローカルに保存した時点で監査ログを残す（GitHub の結果は同期状態として表示するだけ）
+            write_audit("create", new_row["ID"], None, {
+                k: (new_row[k] if k not in ["起票日", "更新日"] else _fmt_display(new_row[k]))
+                for k in new_row.keys()
+            })
+            st.cache_data.clear()
+            ok = save_to_github_csv(df2, background=True)
             if ok:
-                write_audit("create", new_row["ID"], None, {
-                    k: (new_row[k] if k not in ["起票日", "更新日"] else _fmt_display(new_row[k]))
-                    for k in new_row.keys()
-                })
+                maybe_flush_audit()
                 st.success("追加しました（起票・更新はJSTの“いま”）。")
-                st.cache_data.clear()
                 st.rerun()
             else:
-                st.error("GitHub保存に失敗しました。競合の可能性があります。")
+                st.error("ローカルには追加しましたが、GitHub保存に失敗しました。競合の可能性があります。")
 
 # ------------------------------
 # ✏️ 編集・削除
@@ -696,36 +1621,36 @@ with tab_edit:
     else:
         choice_id = st.selectbox(
             "編集対象",
-            options=df_by_id.index.tolist(),
-            format_func=lambda _id: f'[{df_by_id.loc[_id,"対応状況"]}] {df_by_id.loc[_id,"タスク"]} / {df_by_id.loc[_id,"更新者"]} / {_fmt_display(df_by_id.loc[_id,"更新日"])}',
+            options=list(rows_by_id),
+            format_func=lambda _id: f'[{rows_by_id[_id]["対応状況"]}] {rows_by_id[_id]["タスク"]} / {rows_by_id[_id]["更新者"]} / {fmt_by_id[_id]}',
             key="selected_id",
         )
 
-        if choice_id not in df_by_id.index:
+        if choice_id not in rows_by_id:
             st.warning("選択したIDが見つかりません。再読み込みします。")
             st.cache_data.clear()
+            forget_tasks()
             st.rerun()
+        row_e = rows_by_id[choice_id]
 
         with st.form(f"edit_task_{choice_id}"):
             c1, c2, c3 = st.columns(3)
-            task_e = c1.text_input("タスク（件名）", df_by_id.loc[choice_id, "タスク"], key=f"task_{choice_id}")
+            task_e = c1.text_input("タスク（件名）", row_e["タスク"], key=f"task_{choice_id}")
             status_e = c2.selectbox(
-                "対応状況", ["未対応", "対応中", "クローズ"],
-                index=( ["未対応","対応中","クローズ"].index(df_by_id.loc[choice_id,"対応状況"]) if df_by_id.loc[choice_id,"対応状況"] in ["未対応","対応中","クローズ"] else 1 ),
+                "対応状況", STATUS_OPTIONS,
+                index=( STATUS_OPTIONS.index(row_e["対応状況"]) if row_e["対応状況"] in STATUS_OPTIONS else 1 ),
                 key=f"status_{choice_id}"
             )
 
-            fixed_assignees_e = st.secrets.get("FIXED_OWNERS", ["都筑", "二上", "三平", "成瀬", "柿野", "花田", "武藤", "島浦"])
-            ass_choices_e = sorted(set([a for a in df["更新者"].tolist() if str(a).strip() != ""] + list(fixed_assignees_e)))
-            default_assignee = df_by_id.loc[choice_id, "更新者"]
-            ass_index = ass_choices_e.index(default_assignee) if default_assignee in ass_choices_e else 0
-            assignee_e = c3.selectbox("更新者（担当）", options=ass_choices_e, index=ass_index, key=f"assignee_{choice_id}")
+            default_assignee = row_e["更新者"]
+            ass_index = assignee_choices.index(default_assignee) if default_assignee in assignee_choices else 0
+            assignee_e = c3.selectbox("更新者（担当）", options=assignee_choices, index=ass_index, key=f"assignee_{choice_id}")
 
-            next_action_e = st.text_area("次アクション", df_by_id.loc[choice_id, "次アクション"], key=f"next_{choice_id}")
-            notes_e = st.text_area("備考", df_by_id.loc[choice_id, "備考"], key=f"notes_{choice_id}")
-            source_e = st.text_input("ソース（ID/リンクなど）", df_by_id.loc[choice_id, "ソース"], key=f"source_{choice_id}")
+            next_action_e = st.text_area("次アクション", row_e["次アクション"], key=f"next_{choice_id}")
+            notes_e = st.text_area("備考", row_e["備考"], key=f"notes_{choice_id}")
+            source_e = st.text_input("ソース（ID/リンクなど）", row_e["ソース"], key=f"source_{choice_id}")
 
-            st.caption(f"起票日: {_fmt_display(df_by_id.loc[choice_id, '起票日'])} / 最終更新: {_fmt_display(df_by_id.loc[choice_id, '更新日'])}")
+            st.caption(f"起票日: {_fmt_display(row_e['起票日'])} / 最終更新: {fmt_by_id[choice_id]}")
 
             col_ok, col_spacer, col_del = st.columns([1, 1, 1])
             submit_edit = col_ok.form_submit_button("更新する", type="primary")
@@ -735,39 +1660,50 @@ with tab_edit:
             confirm_word = st.text_input("確認ワード（DELETE と入力）", value="", key=f"confirm_{choice_id}")
             delete_btn = col_del.form_submit_button("このタスクを削除", type="secondary")
 
-        if submit_edit:
-            before = df_by_id.loc[choice_id, ["タスク","対応状況","更新者","次アクション","備考","ソース"]].to_dict()
-            df.loc[df["ID"] == choice_id, ["タスク","対応状況","更新者","次アクション","備考","ソース"]] = [
-                task_e, status_e, assignee_e, next_action_e, notes_e, source_e
+        edit_after = {
+            "タスク": task_e, "対応状況": status_e, "更新者": assignee_e,
+            "次アクション": next_action_e, "備考": notes_e, "ソース": source_e
+        }
+        if submit_edit and all(str(row_e[c]) == str(v) for c, v in edit_after.items()):
+            # 何も変わっていなければ更新日も触らず、保存・GitHub 反映・監査ログをすべて省く
+            st.info("変更はありません。")
+        elif submit_edit:
+            before = {c: row_e[c] for c in TEXT_COLS}
+            pos = [pos_by_id[choice_id]]
+            df2 = df.copy()
+            df2.iloc[pos, df2.columns.get_indexer(["タスク","対応状況","更新者","次アクション","備考","ソース","更新日"])] = [
+                task_e, status_e, assignee_e, next_action_e, notes_e, source_e, now_ts_jst()
             ]
-            df.loc[df["ID"] == choice_id, "更新日"] = pd.Timestamp(now_jst())
-            save_tasks(df)
-            ok = save_to_github_csv(debug=False)
+            journal_state = append_journal("upsert", journal_rows(df2, pos))
+            maybe_compact_journal()
+            remember_tasks(df2, data_version, journal_state)
+            write_audit("update", choice_id, before, edit_after)
+            st.cache_data.clear()
+            ok = save_to_github_csv(df2, background=True)
             if ok:
-                write_audit("update", choice_id, before, {
-                    "タスク": task_e, "対応状況": status_e, "更新者": assignee_e,
-                    "次アクション": next_action_e, "備考": notes_e, "ソース": source_e
-                })
+                maybe_flush_audit()
                 st.success("タスクを更新しました（更新日はJSTの“いま”）。")
-                st.cache_data.clear()
                 st.rerun()
             else:
-                st.error("GitHub保存に失敗しました。競合の可能性があります。最新を読み直して再試行してください。")
+                st.error("ローカルには保存しましたが、GitHub保存に失敗しました。競合の可能性があります。最新を読み直して再試行してください。")
 
         elif delete_btn:
             if confirm_word.strip().upper() == "DELETE":
-                before = df_by_id.loc[choice_id, ["タスク","対応状況","更新者","次アクション","備考","ソース"]].to_dict()
-                df2 = df[~df["ID"].eq(choice_id)].copy()
-                save_tasks(df2)
-                ok = save_to_github_csv(debug=False)
+                before = {c: row_e[c] for c in TEXT_COLS}
+                df2 = df[~df["ID"].eq(choice_id)]
+                journal_state = append_journal("delete", [{"ID": choice_id}])
+                maybe_compact_journal()
+                remember_tasks(df2, data_version, journal_state)
+                write_audit("delete", choice_id, before, None)
+                st.cache_data.clear()
+                ok = save_to_github_csv(df2, background=True)
                 st.session_state.pop("selected_id", None)
                 if ok:
-                    write_audit("delete", choice_id, before, None)
+                    maybe_flush_audit()
                     st.success("タスクを削除しました。")
-                    st.cache_data.clear()
                     st.rerun()
                 else:
-                    st.error("GitHub保存に失敗しました。競合の可能性があります。")
+                    st.error("ローカルでは削除しましたが、GitHub保存に失敗しました。競合の可能性があります。")
             else:
                 st.error("確認ワードが正しくありません。`DELETE` と入力してください。")
 
@@ -779,23 +1715,25 @@ with tab_del:
     del_targets = st.multiselect(
         "削除したいタスク（複数選択）",
         options=filtered_df["ID"].tolist(),
-        format_func=lambda _id: f'{df_by_id.loc[_id,"タスク"]} / {df_by_id.loc[_id,"更新者"]} / {_fmt_display(df_by_id.loc[_id,"更新日"])}'
+        format_func=lambda _id: f'{rows_by_id[_id]["タスク"]} / {rows_by_id[_id]["更新者"]} / {fmt_by_id[_id]}'
     )
     confirm_word_bulk = st.text_input("確認ワード（DELETE と入力）", value="", key="confirm_bulk")
     if st.button("選択タスクを削除", disabled=(len(del_targets) == 0)):
         if confirm_word_bulk.strip().upper() == "DELETE":
-            before_map = {tid: df_by_id.loc[tid, ["タスク","対応状況","更新者","次アクション","備考","ソース"]].to_dict() for tid in del_targets}
-            df2 = df[~df["ID"].isin(del_targets)].copy()
-            save_tasks(df2)
-            ok = save_to_github_csv(debug=False)
+            before_map = {tid: {c: rows_by_id[tid][c] for c in TEXT_COLS} for tid in del_targets}
+            df2 = df[~df["ID"].isin(del_targets)]
+            journal_state = append_journal("delete", [{"ID": tid} for tid in del_targets])
+            maybe_compact_journal()
+            remember_tasks(df2, data_version, journal_state)
+            write_audits("delete_bulk", [(tid, before_map.get(tid), None) for tid in del_targets])
+            st.cache_data.clear()
+            ok = save_to_github_csv(df2, background=True)
             if ok:
-                for tid in del_targets:
-                    write_audit("delete_bulk", tid, before_map.get(tid), None)
+                maybe_flush_audit()
                 st.success(f"{len(del_targets)}件のタスクを削除しました。")
-                st.cache_data.clear()
                 st.rerun()
             else:
-                st.error("GitHub保存に失敗しました。競合の可能性があります。")
+                st.error("ローカルでは削除しましたが、GitHub保存に失敗しました。競合の可能性があります。")
         else:
             st.error("確認ワードが正しくありません。`DELETE` と入力してください。")
 
@@ -804,17 +1742,35 @@ with tab_del:
 # ==============================
 colA, colB = st.sidebar.columns(2)
 if colA.button("GitHubへ手動保存"):
-    ok = save_to_github_csv(debug=False)
+    ok = save_to_github_csv(df, debug=False)
     if ok:
         st.sidebar.success("GitHubへ保存完了")
     else:
         st.sidebar.error("GitHub保存失敗")
 if colB.button("GitHub保存の診断"):
-    save_to_github_csv(debug=True)
+    save_to_github_csv(df, debug=True)
+
+unflushed_audit = st.session_state.get("audit_unflushed", 0)
+if st.sidebar.button(f"監査ログをGitHubへ保存（未反映 {unflushed_audit} 件）", disabled=(unflushed_audit == 0)):
+    if flush_audit(debug=False):
+        st.sidebar.success("監査ログを保存しました")
+    else:
+        st.sidebar.error("監査ログの保存に失敗しました")
+
+with st.sidebar.expander("監査ログ（直近）"):
+    if st.checkbox("読み込む", key="show_audit"):
+        audit_df = load_audit()
+        st.dataframe(audit_df.tail(50).iloc[::-1], use_container_width=True, hide_index=True)
+        if st.button("ハッシュチェーンを検証", key="verify_audit"):
+            chain_ok, bad_line = verify_audit_chain()
+            if chain_ok:
+                st.success("改ざんは検出されませんでした")
+            else:
+                st.error(f"{bad_line} 行目で不整合を検出しました")
 
 st.sidebar.caption(f"Secrets keys: {list(st.secrets.keys())}")
 
 # ==============================
 #       フッター
 # ==============================
-st.caption("※ 起票日は新規作成時のみ自動セットし、以後は編集不可（既存値維持）。更新日は編集/クローズ操作でJSTの“いま”に自動更新。GitHub連携はGET→PUTで保存します。")
+st.caption("※ 起票日は新規作成時のみ自動セットし、以後は編集不可（既存値維持）。更新日は編集/クローズ操作でJSTの“いま”に自動更新。ローカルはParquetで保存し、GitHub連携はCSVにエクスポートしてバックグラウンドで保存します（監査ログと同時なら1コミットにまとめます）。")